@@ -2,39 +2,77 @@
 # Based on various available libraries
 
 import machine
+import micropython
+from micropython import const
 
-DS3231_I2C_ADDR = 0x68
+DS3231_I2C_ADDR = const(0x68)
 
 # Register Addresses
-DS3231_REG_SECS = 0x00
-DS3231_REG_MINS = 0x01
-DS3231_REG_HOUR = 0x02 # 12/24 hour mode and AM/PM bit
-DS3231_REG_WDAY = 0x03
-DS3231_REG_MDAY = 0x04
-DS3231_REG_MNTH = 0x05 # Century bit
-DS3231_REG_YEAR = 0x06
-DS3231_REG_TEMP_MSB = 0x11
-DS3231_REG_TEMP_LSB = 0x12
-DS3231_REG_CTRL = 0x0E
-DS3231_REG_STATUS = 0x0F
+DS3231_REG_SECS = const(0x00)
+DS3231_REG_MINS = const(0x01)
+DS3231_REG_HOUR = const(0x02) # 12/24 hour mode and AM/PM bit
+DS3231_REG_WDAY = const(0x03)
+DS3231_REG_MDAY = const(0x04)
+DS3231_REG_MNTH = const(0x05) # Century bit
+DS3231_REG_YEAR = const(0x06)
+DS3231_REG_TEMP_MSB = const(0x11)
+DS3231_REG_TEMP_LSB = const(0x12)
+DS3231_REG_CTRL = const(0x0E)
+DS3231_REG_STATUS = const(0x0F)
+
+# Field indices into the buffer returned by DS3231.datetime_buf()
+DT_YEAR = const(0) # Year within the century (0-99)
+DT_MONTH = const(1)
+DT_MDAY = const(2)
+DT_WDAY = const(3) # 1-7
+DT_HOUR = const(4)
+DT_MINUTE = const(5)
+DT_SECOND = const(6)
+
+
+# Division-free BCD conversions: shifts and masks only.
+def _bcd2dec(b):
+    return (b >> 4) * 10 + (b & 0x0F)
+
+def _dec2bcd(n):
+    q = (n * 205) >> 11 # n // 10, exact for 0 <= n < 1029
+    return (q << 4) | (n - q * 10)
+
+# BCD <-> decimal lookup tables, built once at import.
+# Indexing a bytes object is a single C-level lookup, much cheaper than the
+# //, % and * the conversion would otherwise cost per register byte.
+_BCD2DEC = bytes(_bcd2dec(b) for b in range(256))
+_DEC2BCD = bytes(_dec2bcd(n) for n in range(100)) + bytes(156) # 100..255 -> 0
 
 
 def bcd_to_dec(bcd):
-    return (bcd // 16 * 10) + (bcd % 16)
+    return _BCD2DEC[bcd]
 
 def dec_to_bcd(dec):
-    return (dec // 10 * 16) + (dec % 10)
+    return _DEC2BCD[dec]
+
+# Temperature registers as a signed count of 0.25 C steps. The MSB is a two's
+# complement integer part and LSB bits 7:6 the fraction, so -0.25 C reads as
+# 0xFF/0xC0 (-1 + 0.75). Viper keeps this as plain machine-int arithmetic.
+@micropython.viper
+def _temp_quarters(msb: int, lsb: int) -> int:
+    return ((msb - ((msb & 0x80) << 1)) << 2) | (lsb >> 6)
+
 
 class DS3231:
     def __init__(self, i2c):
         self.i2c = i2c
         self.buf1 = bytearray(1)
+        self.buf2 = bytearray(2)
         self.buf7 = bytearray(7)
+        self._dt_buf = bytearray(8) # Decoded datetime, see datetime_buf()
         
-        # Ensure EOSC is not set (oscillator enabled)
-        self._clear_bit(DS3231_REG_CTRL, 7) # EOSC is bit 7
-        # Ensure OSF is cleared
-        self._clear_bit(DS3231_REG_STATUS, 7) # OSF is bit 7
+        # Control (0x0E) and status (0x0F) are adjacent, so both are handled
+        # in one read and one write rather than two read-modify-writes.
+        self.i2c.readfrom_mem_into(DS3231_I2C_ADDR, DS3231_REG_CTRL, self.buf2)
+        self.buf2[0] &= 0x7F # Ensure EOSC (bit 7) is not set (oscillator enabled)
+        self.buf2[1] &= 0x7F # Ensure OSF (bit 7) is cleared
+        self.i2c.writeto_mem(DS3231_I2C_ADDR, DS3231_REG_CTRL, self.buf2)
 
     def _read_reg(self, reg_addr):
         self.i2c.readfrom_mem_into(DS3231_I2C_ADDR, reg_addr, self.buf1)
@@ -54,6 +92,37 @@ class DS3231:
         val &= ~(1 << bit)
         self._write_reg(reg_addr, val)
         
+    def datetime_buf(self):
+        """
+        Read the date and time into a preallocated 8-byte buffer and return it.
+        Layout, indexed by the DT_* constants:
+        (year % 100, month, day, weekday, hour, minute, second, 0)
+        Nothing is allocated, so this suits a polling loop; the buffer is
+        overwritten by the next call, so copy it if the values must be kept.
+        """
+        self.i2c.readfrom_mem_into(DS3231_I2C_ADDR, DS3231_REG_SECS, self.buf7)
+        buf = self.buf7
+        dt = self._dt_buf
+        dt[DT_SECOND] = _BCD2DEC[buf[0] & 0x7F]
+        dt[DT_MINUTE] = _BCD2DEC[buf[1] & 0x7F]
+        hour_reg = buf[2]
+        if hour_reg & 0x40: # 12-hour mode
+            hour = _BCD2DEC[hour_reg & 0x1F]
+            if hour_reg & 0x20 and hour != 12: # PM bit set
+                hour += 12
+            elif not (hour_reg & 0x20) and hour == 12: # AM bit not set, hour is 12 (midnight)
+                hour = 0
+            dt[DT_HOUR] = hour
+        else: # 24-hour mode
+            dt[DT_HOUR] = _BCD2DEC[hour_reg & 0x3F]
+
+        dt[DT_WDAY] = _BCD2DEC[buf[3] & 0x07] # 1-7
+        dt[DT_MDAY] = _BCD2DEC[buf[4] & 0x3F]
+        # century = 1 if buf[5] & 0x80 else 0 # Not directly used for year calculation here
+        dt[DT_MONTH] = _BCD2DEC[buf[5] & 0x1F]
+        dt[DT_YEAR] = _BCD2DEC[buf[6]]
+        return dt
+
     def datetime(self, dt=None):
         """
         Get or set the date and time.
@@ -64,72 +133,48 @@ class DS3231:
         """
         if dt is None:
             # Get time
-            self.i2c.readfrom_mem_into(DS3231_I2C_ADDR, DS3231_REG_SECS, self.buf7)
-            sec = bcd_to_dec(self.buf7[0] & 0x7F)
-            minute = bcd_to_dec(self.buf7[1] & 0x7F)
-            hour_reg = self.buf7[2]
-            if hour_reg & 0x40: # 12-hour mode
-                hour = bcd_to_dec(hour_reg & 0x1F)
-                if hour_reg & 0x20 and hour != 12: # PM bit set
-                    hour += 12
-                elif not (hour_reg & 0x20) and hour == 12: # AM bit not set, hour is 12 (midnight)
-                    hour = 0
-            else: # 24-hour mode
-                hour = bcd_to_dec(hour_reg & 0x3F)
-            
-            wday = bcd_to_dec(self.buf7[3] & 0x07) # 1-7
-            mday = bcd_to_dec(self.buf7[4] & 0x3F)
-            month_reg = self.buf7[5]
-            month = bcd_to_dec(month_reg & 0x1F)
-            # century = 1 if month_reg & 0x80 else 0 # Not directly used for year calculation here
-            year = bcd_to_dec(self.buf7[6]) + 2000 # Assumes 21st century
-            return (year, month, mday, wday, hour, minute, sec, 0) # Adding 0 for subseconds to somewhat match struct_time
+            b = self.datetime_buf()
+            year = b[DT_YEAR] + 2000 # Assumes 21st century
+            return (year, b[DT_MONTH], b[DT_MDAY], b[DT_WDAY], b[DT_HOUR], b[DT_MINUTE], b[DT_SECOND], 0) # Adding 0 for subseconds to somewhat match struct_time
 
         else:
             # Set time
             year, month, mday, wday, hour, minute, sec, _ = dt
             
-            self.buf7[0] = dec_to_bcd(sec) & 0x7F
-            self.buf7[1] = dec_to_bcd(minute) & 0x7F
+            buf = self.buf7
+            buf[0] = _DEC2BCD[sec] & 0x7F
+            buf[1] = _DEC2BCD[minute] & 0x7F
             # Assuming 24 hour mode. Bit 6 must be 0 for 24hr mode.
-            self.buf7[2] = dec_to_bcd(hour) & 0x3F 
-            self.buf7[3] = dec_to_bcd(wday) & 0x07 # 1-7
-            self.buf7[4] = dec_to_bcd(mday) & 0x3F
+            buf[2] = _DEC2BCD[hour] & 0x3F 
+            buf[3] = _DEC2BCD[wday] & 0x07 # 1-7
+            buf[4] = _DEC2BCD[mday] & 0x3F
             
             # Clear century bit for now, handle if needed
-            self.buf7[5] = dec_to_bcd(month) & 0x1F
+            buf[5] = _DEC2BCD[month] & 0x1F
             if year >= 2100: # Century bit needs to be set
-                 self.buf7[5] |= 0x80
+                 buf[5] |= 0x80
             
-            self.buf7[6] = dec_to_bcd(year % 100)
+            buf[6] = _DEC2BCD[year % 100]
             
             self.i2c.writeto_mem(DS3231_I2C_ADDR, DS3231_REG_SECS, self.buf7)
             
-            # Clear OSF flag after setting time
-            self._clear_bit(DS3231_REG_STATUS, 7)
+            # Clear OSF flag after setting time. It is normally already clear
+            # (the constructor clears it), so only write back when it is set.
+            status = self._read_reg(DS3231_REG_STATUS)
+            if status & 0x80:
+                self._write_reg(DS3231_REG_STATUS, status & 0x7F)
 
 
     def temperature(self):
         """Return temperature in Celsius."""
-        msb = self._read_reg(DS3231_REG_TEMP_MSB)
-        lsb = self._read_reg(DS3231_REG_TEMP_LSB)
+        # MSB and LSB are adjacent and the register pointer auto-increments,
+        # so both come back in a single 2-byte read.
+        self.i2c.readfrom_mem_into(DS3231_I2C_ADDR, DS3231_REG_TEMP_MSB, self.buf2)
+        msb = self.buf2[0]
+        lsb = self.buf2[1]
         # Temperature is in units of 0.25 degrees C.
         # MSB is integer part, LSB bits 7 and 6 are fractional part.
-        temp = float(msb) # Integer part
-        if lsb & 0x80: # Check bit 7
-            temp += 0.5
-        if lsb & 0x40: # Check bit 6
-            temp += 0.25
-        # Handle negative temperatures (MSB sign bit)
-        if msb & 0x80: # if sign bit is set
-            # This conversion is simplified, assumes positive for now as per most RTC examples
-            # A more robust conversion for negative values might be needed if temps go below 0.
-            # For simplicity, if msb is e.g. 0b1xxxxxxx, it's negative.
-            # Example: -0.25C is 11111111.11 (-1 + 0.75)
-            # Let's assume positive temperatures for this project as per the example.
-            pass
-
-        return temp
+        return _temp_quarters(msb, lsb) * 0.25
 
     def start_temperature_conversion(self):
         """
@@ -142,6 +187,8 @@ class DS3231:
         A simple way is to set the CONV bit (bit 5) in the Control Register (0x0E).
         It will be reset automatically after conversion.
         """
+        # One read of the control register; write back only if CONV (bit 5)
+        # still needs setting. Costs 2 I2C transactions, or 1 if already set.
         current_ctrl = self._read_reg(DS3231_REG_CTRL)
         if not (current_ctrl & (1<<5)): # if CONV is not already set
             self._write_reg(DS3231_REG_CTRL, current_ctrl | (1<<5))
@@ -151,16 +198,6 @@ class DS3231:
         # For simplicity, we will not poll here in the library function.
         # The main code can call this then read temp after a small delay if needed,
         # or rely on the automatic 64s conversion cycle.
-        # The example's `force_temperature_conversion` in CircuitPython likely handles the wait.
-        # For MicroPython, it might be better to just read the temp registers.
-        # The DS3231 updates the temperature registers automatically every 64s.
-        # If more frequent updates are needed, this CONV bit logic is used.
-
-        # Let's make this function just trigger it, and the user can read later.
-        # Or, for very basic use, just reading temp registers is enough.
-        # The article's `force_temperature_conversion` suggests an active process.
-        # Let's ensure the CONV bit is set if we want an immediate conversion.
-        self._set_bit(DS3231_REG_CTRL, 5) # Set CONV bit
         # Polling for completion:
         # while self._read_reg(DS3231_REG_CTRL) & (1<<5):
         #     pass # Wait for CONV bit to clear
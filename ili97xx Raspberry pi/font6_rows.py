@@ -0,0 +1,8 @@
+# Generated by font_rowmajor.py from font6.py. Do not edit.
+# Row-major glyph strips for writer.Writer(..., rows=<this module>)
+
+index = {
+    232: 0,
+}
+
+rows = b'\x06\x00\x0008\x0c\x0c'
@@ -0,0 +1,105 @@
+# font_rowmajor.py Convert a Writer font to row-major glyph strips.
+# Run on the host (CPython), not on the Pico:
+#     python font_rowmajor.py font6.py
+# writes font6_rows.py next to it. Pass that module to Writer as rows=:
+#     wri = Writer(display, font6._font, rows=font6_rows)
+
+# Writer fonts store each glyph column by column (pixel col, row is bit
+# row % 8 of byte (col*height + row) // 8, as read by Writer.draw_char), so
+# decoding a glyph for a row-by-row block write needs per-pixel addressing.
+# The generated module holds the same glyphs as rows of ceil(width/8) bytes,
+# bit k of byte j being column 8*j + k. Writer expands each byte into 8
+# RGB565 pixels with one table lookup.
+
+# Generated module:
+# index  dict: glyph address in the font (as returned by _get_char_addr)
+#        -> offset of that glyph in rows
+# rows   bytes: per glyph, the width byte followed by height rows
+
+import os
+import sys
+
+_TWO_BYTE_INDEX = 0
+_MAX_CHARS = 2
+_HEIGHT = 3
+_MISSING = 5
+_LAST_CHAR = 7
+
+
+# Same addressing as writer._get_char_addr
+def _get_char_addr(font, letter):
+    index = font[_MAX_CHARS]
+    two_byte = font[index] == _TWO_BYTE_INDEX
+    index += 1
+    if letter >= font[_LAST_CHAR] or letter < font[_MISSING + 2]: # font[_FIRST_CHAR]:
+        letter = font[_MISSING]  # Character is missing
+    letter -= font[_MISSING + 2] # font[_FIRST_CHAR]
+    if two_byte:
+        idx = index + letter * 2
+        offset = font[idx] << 8 | font[idx + 1]
+    else:
+        offset = font[index + letter]
+    return offset + index + 1 + (font[_LAST_CHAR] - font[_MISSING + 2]) * two_byte
+
+
+# Return (index, rows) for every glyph reachable from char codes 0-255
+def convert(font):
+    height = font[_HEIGHT]
+    index = {}
+    rows = bytearray()
+    for char_code in range(256):
+        addr = _get_char_addr(font, char_code)
+        if addr in index:
+            continue
+        width = font[addr]
+        stride = (width + 7) >> 3
+        glyph = bytearray(1 + stride * height)
+        glyph[0] = width
+        for row in range(height):
+            for col in range(width):
+                if font[addr + 1 + ((col * height + row) >> 3)] & (1 << (row & 7)):
+                    glyph[1 + row * stride + (col >> 3)] |= 1 << (col & 7)
+        index[addr] = len(rows)
+        rows += glyph
+    return index, bytes(rows)
+
+
+# Load the _font bytes from a font module without importing it: font
+# modules use MicroPython's const(), which CPython lacks. Errors after
+# _font is defined (e.g. in trailing convenience lines) are ignored.
+def load_font(path):
+    env = {'const': lambda x: x}
+    with open(path) as f:
+        try:
+            exec(f.read(), env)
+        except NameError:
+            if '_font' not in env:
+                raise
+    return env['_font']
+
+
+def write_module(path, src_name, index, rows):
+    with open(path, 'w') as f:
+        f.write('# Generated by font_rowmajor.py from {}. Do not edit.\n'.format(src_name))
+        f.write('# Row-major glyph strips for writer.Writer(..., rows=<this module>)\n\n')
+        f.write('index = {\n')
+        for addr in sorted(index):
+            f.write('    {}: {},\n'.format(addr, index[addr]))
+        f.write('}\n\n')
+        f.write('rows = {!r}\n'.format(rows))
+
+
+def main(argv):
+    if len(argv) != 2:
+        print('Usage: python font_rowmajor.py <font module .py>')
+        return 1
+    src = argv[1]
+    index, rows = convert(load_font(src))
+    dst = os.path.splitext(src)[0] + '_rows.py'
+    write_module(dst, os.path.basename(src), index, rows)
+    print('Wrote {} ({} glyphs, {} bytes)'.format(dst, len(index), len(rows)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -1,71 +1,83 @@
 # MicroPython ILI9341 SPI display driver
 # Adapted from rdagger/micropython-ili9341 and other sources
 
+import framebuf
 import machine
+import micropython
+from micropython import const
 import time
 import ustruct
 
+try:
+    import _thread # For QueuedDisplay; absent on ports without threads
+except ImportError:
+    _thread = None
+
 # Commands
-ILI9341_NOP = 0x00
-ILI9341_SWRESET = 0x01
-ILI9341_RDDID = 0x04
-ILI9341_RDDST = 0x09
-
-ILI9341_SLPIN = 0x10
-ILI9341_SLPOUT = 0x11
-ILI9341_PTLON = 0x12
-ILI9341_NORON = 0x13
-
-ILI9341_RDMODE = 0x0A
-ILI9341_RDMADCTL = 0x0B
-ILI9341_RDPIXFMT = 0x0C
-ILI9341_RDIMGFMT = 0x0D
-ILI9341_RDSELFDIAG = 0x0F
-
-ILI9341_INVOFF = 0x20
-ILI9341_INVON = 0x21
-ILI9341_GAMMASET = 0x26
-ILI9341_DISPOFF = 0x28
-ILI9341_DISPON = 0x29
-
-ILI9341_CASET = 0x2A
-ILI9341_PASET = 0x2B
-ILI9341_RAMWR = 0x2C
-ILI9341_RAMRD = 0x2E
-
-ILI9341_PTLAR = 0x30
-ILI9341_MADCTL = 0x36
-ILI9341_PIXFMT = 0x3A
-
-ILI9341_FRMCTR1 = 0xB1
-ILI9341_FRMCTR2 = 0xB2
-ILI9341_FRMCTR3 = 0xB3
-ILI9341_INVCTR = 0xB4
-ILI9341_DFUNCTR = 0xB6
-
-ILI9341_PWCTR1 = 0xC0
-ILI9341_PWCTR2 = 0xC1
-ILI9341_PWCTR3 = 0xC2
-ILI9341_PWCTR4 = 0xC3
-ILI9341_PWCTR5 = 0xC4
-ILI9341_VMCTR1 = 0xC5
-ILI9341_VMCTR2 = 0xC7
-
-ILI9341_RDID1 = 0xDA
-ILI9341_RDID2 = 0xDB
-ILI9341_RDID3 = 0xDC
-ILI9341_RDID4 = 0xDD
-
-ILI9341_GMCTRP1 = 0xE0
-ILI9341_GMCTRN1 = 0xE1
+ILI9341_NOP = const(0x00)
+ILI9341_SWRESET = const(0x01)
+ILI9341_RDDID = const(0x04)
+ILI9341_RDDST = const(0x09)
+
+ILI9341_SLPIN = const(0x10)
+ILI9341_SLPOUT = const(0x11)
+ILI9341_PTLON = const(0x12)
+ILI9341_NORON = const(0x13)
+
+ILI9341_RDMODE = const(0x0A)
+ILI9341_RDMADCTL = const(0x0B)
+ILI9341_RDPIXFMT = const(0x0C)
+ILI9341_RDIMGFMT = const(0x0D)
+ILI9341_RDSELFDIAG = const(0x0F)
+
+ILI9341_INVOFF = const(0x20)
+ILI9341_INVON = const(0x21)
+ILI9341_GAMMASET = const(0x26)
+ILI9341_DISPOFF = const(0x28)
+ILI9341_DISPON = const(0x29)
+
+ILI9341_CASET = const(0x2A)
+ILI9341_PASET = const(0x2B)
+ILI9341_RAMWR = const(0x2C)
+ILI9341_RAMRD = const(0x2E)
+
+ILI9341_PTLAR = const(0x30)
+ILI9341_MADCTL = const(0x36)
+ILI9341_PIXFMT = const(0x3A)
+
+ILI9341_FRMCTR1 = const(0xB1)
+ILI9341_FRMCTR2 = const(0xB2)
+ILI9341_FRMCTR3 = const(0xB3)
+ILI9341_INVCTR = const(0xB4)
+ILI9341_DFUNCTR = const(0xB6)
+
+ILI9341_PWCTR1 = const(0xC0)
+ILI9341_PWCTR2 = const(0xC1)
+ILI9341_PWCTR3 = const(0xC2)
+ILI9341_PWCTR4 = const(0xC3)
+ILI9341_PWCTR5 = const(0xC4)
+ILI9341_VMCTR1 = const(0xC5)
+ILI9341_VMCTR2 = const(0xC7)
+
+ILI9341_RDID1 = const(0xDA)
+ILI9341_RDID2 = const(0xDB)
+ILI9341_RDID3 = const(0xDC)
+ILI9341_RDID4 = const(0xDD)
+
+ILI9341_GMCTRP1 = const(0xE0)
+ILI9341_GMCTRN1 = const(0xE1)
 
 # MADCTL Bits
-ILI9341_MADCTL_MY = 0x80  # Row address order
-ILI9341_MADCTL_MX = 0x40  # Column address order
-ILI9341_MADCTL_MV = 0x20  # Row/Column exchange
-ILI9341_MADCTL_ML = 0x10  # Vertical refresh order
-ILI9341_MADCTL_BGR = 0x08 # BGR-RGB order
-ILI9341_MADCTL_MH = 0x04  # Horizontal refresh order
+ILI9341_MADCTL_MY = const(0x80)  # Row address order
+ILI9341_MADCTL_MX = const(0x40)  # Column address order
+ILI9341_MADCTL_MV = const(0x20)  # Row/Column exchange
+ILI9341_MADCTL_ML = const(0x10)  # Vertical refresh order
+ILI9341_MADCTL_BGR = const(0x08) # BGR-RGB order
+ILI9341_MADCTL_MH = const(0x04)  # Horizontal refresh order
+
+# Scanlines held in the fill buffer. Larger buffers mean fewer SPI write
+# calls per fill (a full-screen clear is 20 writes) at the cost of RAM.
+_FILL_LINES = const(16)
 
 # Screen dimensions (update if your display is different)
 ILI9341_TFTWIDTH = 240
@@ -82,11 +94,75 @@ YELLOW = 0xFFE0
 WHITE = 0xFFFF
 
 
-def color565(r, g, b):
+@micropython.viper
+def color565(r: int, g: int, b: int) -> int:
     """Convert RGB888 to RGB565"""
     return (r & 0xF8) << 8 | (g & 0xFC) << 3 | b >> 3
 
 
+# Small per-color pixel runs shared by all instances. Short fills (hline,
+# vline, glyph-sized rectangles) come from here, so alternating colors does
+# not force the large fill buffer to be repacked. At most _PALETTE_MAX colors
+# of _PALETTE_PIXELS pixels are kept (2 KB, plus the views below); the
+# cache is reset when full.
+# Each color maps to a list whose entry n is a view of its first n pixels,
+# made on first use, so a repeated fill length allocates nothing.
+_PALETTE_PIXELS = const(64)
+_PALETTE_MAX = const(16)
+_PALETTE_BUFS = {}
+
+
+def _buf_for(color, n):
+    # n pixels of color, 0 < n <= _PALETTE_PIXELS
+    views = _PALETTE_BUFS.get(color)
+    if views is None:
+        if len(_PALETTE_BUFS) >= _PALETTE_MAX:
+            _PALETTE_BUFS.clear()
+        views = [None] * (_PALETTE_PIXELS + 1)
+        views[_PALETTE_PIXELS] = memoryview(ustruct.pack(">H", color) * _PALETTE_PIXELS)
+        _PALETTE_BUFS[color] = views
+    mv = views[n]
+    if mv is None:
+        mv = views[_PALETTE_PIXELS][:2 * n]
+        views[n] = mv
+    return mv
+
+
+# Native-compiled loop for streaming the same buffer repeatedly (used by fills).
+# The SPI write is still a Python call, but the loop control runs as machine code.
+@micropython.native
+def _blast(spi, buf, count):
+    for _ in range(count):
+        spi.write(buf)
+
+
+# Copy n bytes of RGB565 from src to dst swapping each byte pair: framebuf
+# stores pixels little-endian, the panel expects big-endian.
+@micropython.viper
+def _swap_copy(src: ptr8, dst: ptr8, n: int):
+    i = 0
+    while i < n:
+        dst[i] = src[i + 1]
+        dst[i + 1] = src[i]
+        i += 2
+
+
+# Copy a w x h big-endian RGB565 block into a little-endian frame buffer
+# dw pixels wide at (x, y), swapping each byte pair
+@micropython.viper
+def _swap_blit(src: ptr8, dst: ptr8, dw: int, x: int, y: int, w: int, h: int):
+    row_bytes = w * 2
+    s = 0
+    for r in range(h):
+        d = ((y + r) * dw + x) * 2
+        i = 0
+        while i < row_bytes:
+            dst[d + i] = src[s + i + 1]
+            dst[d + i + 1] = src[s + i]
+            i += 2
+        s += row_bytes
+
+
 class ILI9341:
     def __init__(self, spi, cs, dc, rst, width=ILI9341_TFTWIDTH, height=ILI9341_TFTHEIGHT, rotation=0):
         self.spi = spi
@@ -95,6 +171,14 @@ class ILI9341:
         self.rst = rst
         self.width = width
         self.height = height
+        # Scratch buffer for fill_rectangle, refilled only when the color changes
+        self._fill_buf = bytearray(2 * width * _FILL_LINES)
+        self._fill_color = None
+        # Preallocated scratch buffers so commands and single pixels don't allocate
+        self._cmdbuf = bytearray(1)
+        self._pixbuf = bytearray(2)
+        self._pixcolor = None # Color currently packed in _pixbuf
+        self._winbuf = bytearray(4)
         
         self.cs.init(self.cs.OUT, value=1)
         self.dc.init(self.dc.OUT, value=0)
@@ -107,9 +191,10 @@ class ILI9341:
         self.fill(BLACK) # Clear screen
 
     def _write_cmd(self, cmd):
+        self._cmdbuf[0] = cmd
         self.cs.value(0)
         self.dc.value(0)
-        self.spi.write(bytearray([cmd]))
+        self.spi.write(self._cmdbuf)
         self.cs.value(1)
 
     def _write_data(self, data):
@@ -198,18 +283,43 @@ class ILI9341:
         self._RAM_WRITE = ILI9341_RAMWR
         self._RAM_READ = ILI9341_RAMRD
 
+    # Sends CASET/PASET/RAMWR in one CS-low transaction, only toggling DC
+    # between command and data bytes. CS is left asserted so the caller can
+    # stream pixel data straight away; the caller must release it.
     def _set_window(self, x0, y0, x1, y1):
-        self._write_cmd(self._COLUMN_SET)
-        self._write_data(ustruct.pack(">HH", x0, x1))
-        self._write_cmd(self._PAGE_SET)
-        self._write_data(ustruct.pack(">HH", y0, y1))
-        self._write_cmd(self._RAM_WRITE)
+        cs = self.cs
+        dc = self.dc
+        spi = self.spi
+        cmd = self._cmdbuf
+        win = self._winbuf
+        cs.value(0)
+        dc.value(0)
+        cmd[0] = self._COLUMN_SET
+        spi.write(cmd)
+        dc.value(1)
+        ustruct.pack_into(">HH", win, 0, x0, x1)
+        spi.write(win)
+        dc.value(0)
+        cmd[0] = self._PAGE_SET
+        spi.write(cmd)
+        dc.value(1)
+        ustruct.pack_into(">HH", win, 0, y0, y1)
+        spi.write(win)
+        dc.value(0)
+        cmd[0] = self._RAM_WRITE
+        spi.write(cmd)
 
     def pixel(self, x, y, color):
         if not (0 <= x < self.width and 0 <= y < self.height):
             return
         self._set_window(x, y, x, y)
-        self._write_data(ustruct.pack(">H", color))
+        if color != self._pixcolor:
+            # Runs of pixels mostly share a color: only repack when it changes
+            ustruct.pack_into(">H", self._pixbuf, 0, color)
+            self._pixcolor = color
+        self.dc.value(1)
+        self.spi.write(self._pixbuf)
+        self.cs.value(1)
 
     def fill_rectangle(self, x, y, w, h, color):
         x = min(self.width - 1, max(0, x))
@@ -217,24 +327,39 @@ class ILI9341:
         w = min(self.width - x, max(1, w))
         h = min(self.height - y, max(1, h))
 
-        self._set_window(x, y, x + w - 1, y + h - 1)
-        
-        # Prepare buffer with color
-        chunk_size = 512 # Max SPI buffer size or reasonable chunk
-        pixels_per_chunk = chunk_size // 2
         num_pixels = w * h
+        self._set_window(x, y, x + w - 1, y + h - 1)
+
+        if num_pixels <= _PALETTE_PIXELS:
+            # CS is still low from _set_window
+            self.dc.value(1) # Data mode
+            self.spi.write(_buf_for(color, num_pixels))
+            self.cs.value(1)
+            return
         
-        buf = ustruct.pack(">H", color) * pixels_per_chunk
+        # Reuse the cached color buffer; only repack it when the color changes
+        buf = self._fill_buf
+        mv = memoryview(buf)
+        if color != self._fill_color:
+            # Pack one pixel, then double the filled prefix until the buffer is full
+            ustruct.pack_into(">H", buf, 0, color)
+            n = 2
+            size = len(buf)
+            while n < size:
+                k = min(n, size - n)
+                mv[n:n + k] = mv[:k]
+                n += k
+            self._fill_color = color
+        pixels_per_chunk = len(buf) // 2
         
-        self.cs.value(0)
+        # CS is still low from _set_window
         self.dc.value(1) # Data mode
 
-        for _ in range(num_pixels // pixels_per_chunk):
-            self.spi.write(buf)
+        _blast(self.spi, mv, num_pixels // pixels_per_chunk)
         
         remaining_pixels = num_pixels % pixels_per_chunk
         if remaining_pixels > 0:
-            self.spi.write(ustruct.pack(">H", color) * remaining_pixels)
+            self.spi.write(mv[:remaining_pixels * 2])
             
         self.cs.value(1)
 
@@ -248,6 +373,16 @@ class ILI9341:
     def vline(self, x, y, h, color):
         self.fill_rectangle(x, y, 1, h, color)
 
+    def blit_buffer(self, buf, x, y, w, h):
+        """
+        Write a w x h block of big-endian RGB565 pixels (len(buf) == 2*w*h)
+        at (x, y) in one SPI transaction. The block must lie on screen.
+        """
+        self._set_window(x, y, x + w - 1, y + h - 1)
+        self.dc.value(1)
+        self.spi.write(buf)
+        self.cs.value(1)
+
     # Basic text drawing (using a simple built-in font or placeholder)
     # For more advanced text, a separate font library (like writer.py) is recommended.
     # This is a very rudimentary text function.
@@ -257,8 +392,9 @@ class ILI9341:
         It's recommended to use a proper font rendering library (e.g. writer.py).
         """
         # This is where you'd integrate with a font library.
-        # For now, we'll just print a message indicating it's a placeholder
-        # or draw very simple pixels if no advanced font lib is used.
+        # For now only the optional background is drawn; there is deliberately
+        # no console output, as a print here would block on the UART if this
+        # were ever called from a redraw loop.
         
         # If a background color is provided, fill the text area
         if background is not None:
@@ -274,10 +410,141 @@ class ILI9341:
         
         # As a simple placeholder, draw a small rectangle where text would be
         # self.fill_rectangle(x, y, len(s) * 5, 7, color)
-        print(f"ILI9341.text placeholder: '{s}' at ({x},{y}) color {color}, size {size}")
         # If using with writer.py, the writer object would handle this.
 
 
+class FrameRegion(framebuf.FrameBuffer):
+    """
+    In-RAM RGB565 image of a width x height area of an ILI9341. Compose it
+    with the (C) framebuf methods or a Writer, then send it with show() as
+    a single block write. blit_buffer() takes the same panel-order blocks
+    as ILI9341.blit_buffer(), so a Writer's cached glyphs and digit strip
+    are copied in rather than re-rasterized.
+    """
+    def __init__(self, display, width, height):
+        self.display = display
+        self.width = width
+        self.height = height
+        self.buffer = bytearray(width * height * 2)
+        # Panel-order copy that is actually sent. Separate from buffer so the
+        # region can be redrawn while a QueuedDisplay is still sending it.
+        self._out = bytearray(len(self.buffer))
+        super().__init__(self.buffer, width, height, framebuf.RGB565)
+
+    def blit_buffer(self, buf, x, y, w, h):
+        """Copy a w x h big-endian RGB565 block to (x, y), which must lie inside the region."""
+        _swap_blit(buf, self.buffer, self.width, x, y, w, h)
+
+    def show(self, x, y):
+        """Send the whole region to the display at (x, y), which must be on screen."""
+        wait = getattr(self.display, 'wait', None)
+        if wait is not None:
+            wait() # The previous show() may still be queued
+        out = self._out
+        _swap_copy(self.buffer, out, len(out))
+        self.display.blit_buffer(out, x, y, self.width, self.height)
+
+
+class QueuedDisplay:
+    """
+    Stands in for an ILI9341, running its drawing calls in order on a
+    second thread (on the RP2040, the second core) so the caller can read
+    the RTC and prepare the next update while SPI transfers run. Buffers
+    passed to blit_buffer() must not change until wait() returns. A call
+    that fails on the worker is raised by the next queued call or wait().
+    Any other attribute is forwarded to the display, and every such lookup
+    first blocks in wait() until the queue is empty, so avoid them on hot
+    paths. Raises RuntimeError or OSError if no thread can be started.
+    """
+    # No in-RAM frame buffer. Declared so that Writer's per-glyph
+    # getattr(display, 'buffer', None) is answered here rather than by
+    # __getattr__, which would wait for the queue to drain.
+    buffer = None
+
+    def __init__(self, display, depth=32):
+        if _thread is None:
+            raise RuntimeError("QueuedDisplay needs _thread")
+        self.display = display
+        self._depth = depth
+        self._queue = []
+        self._lock = _thread.allocate_lock()
+        self._busy = False # Worker is running a call taken off the queue
+        self._error = None # Exception raised by the last failed call
+        _thread.start_new_thread(self._worker, ())
+
+    def _worker(self):
+        queue = self._queue
+        lock = self._lock
+        while True:
+            lock.acquire()
+            if queue:
+                self._busy = True # Before the pop, so wait() never sees neither
+                fn, args = queue.pop(0)
+            else:
+                fn = None
+            lock.release()
+            if fn is None:
+                time.sleep_ms(1)
+                continue
+            try:
+                fn(*args)
+            except Exception as e:
+                self._error = e
+            self._busy = False
+
+    # Read through to the display so a forwarded set_rotation() is seen
+    @property
+    def width(self):
+        return self.display.width
+
+    @property
+    def height(self):
+        return self.display.height
+
+    # Raise (once) the exception of a call that failed on the worker
+    def _raise_error(self):
+        err = self._error
+        if err is not None:
+            self._error = None
+            raise err
+
+    def _put(self, fn, args):
+        while len(self._queue) >= self._depth:
+            time.sleep_ms(1) # Let the worker catch up
+        self._raise_error()
+        self._lock.acquire()
+        self._queue.append((fn, args))
+        self._lock.release()
+
+    def wait(self):
+        """Block until every queued call has run; raise any failure among them."""
+        while self._queue or self._busy:
+            time.sleep_ms(1)
+        self._raise_error()
+
+    def pixel(self, x, y, color):
+        self._put(self.display.pixel, (x, y, color))
+
+    def fill_rectangle(self, x, y, w, h, color):
+        self._put(self.display.fill_rectangle, (x, y, w, h, color))
+
+    def fill(self, color):
+        self._put(self.display.fill, (color,))
+
+    def hline(self, x, y, w, color):
+        self._put(self.display.hline, (x, y, w, color))
+
+    def vline(self, x, y, h, color):
+        self._put(self.display.vline, (x, y, h, color))
+
+    def blit_buffer(self, buf, x, y, w, h):
+        self._put(self.display.blit_buffer, (buf, x, y, w, h))
+
+    def __getattr__(self, name):
+        self.wait()
+        return getattr(self.display, name)
+
+
 # Example of how to use with a font writer (e.g. Peter Hinch's writer.py)
 # You would typically pass the ILI9341 instance to the Writer class.
 # from writer import Writer
@@ -2,21 +2,38 @@
 # main.py for Raspberry Pi Pico with DS3231 RTC and ILI9341 Display , so this is a simple clock with temperature display 
 
 import machine
+import micropython
 import time
 import uos # For checking if lib exists, though not strictly needed now
 
-# Attempt to import library files from /lib directory
+# Attempt to import library files from /lib directory, then as modules frozen
+# into the firmware (see manifest.py)
 try:
     from lib import ds3231
     from lib import ili9341
     from lib import writer
     from lib import font6 # Assuming font6.py contains `_font` bytearray
 except ImportError:
-    print("Error: Ensure ds3231.py, ili9341.py, writer.py, and font6.py are in the /lib folder on your Pico.")
+    try:
+        import ds3231
+        import ili9341
+        import writer
+        import font6
+    except ImportError:
+        print("Error: Ensure ds3231, ili9341, writer, and font6 (.py or precompiled .mpy) are in the /lib folder on your Pico, or frozen into the firmware.")
     # Optional: halt execution if libs are missing
     # while True:
     #     pass 
 
+# Row-major copy of font6 made by font_rowmajor.py (optional, speeds up glyph rendering)
+try:
+    from lib import font6_rows
+except ImportError:
+    try:
+        import font6_rows
+    except ImportError:
+        font6_rows = None
+
 # Pin definitions (as per plan)
 # I2C for DS3231
 I2C_SDA_PIN = 0
@@ -29,11 +46,23 @@ SPI_MISO_PIN = 16 # Set to -1 or None if not used by your specific ILI9341 board
 ILI9341_CS_PIN = 17
 ILI9341_DC_PIN = 20
 ILI9341_RST_PIN = 21
+# Requested SPI clock. The RP2040 divides clk_peri (125 MHz), so 62.5 MHz is the
+# fastest exact rate; a 40 MHz request actually rounds down to 31.25 MHz.
+# Most ILI9341 modules cope; drop back to 40000000 if the display shows artifacts.
+SPI_BAUDRATE = 62500000
 
 # Display dimensions (default for ILI9341)
 DISPLAY_WIDTH = 240
 DISPLAY_HEIGHT = 320
 
+# Main loop polling period. The RTC is polled at 10 Hz but the screen is only
+# redrawn when the reading changes, i.e. once per second.
+POLL_INTERVAL_MS = 100
+
+# Run SPI drawing on the RP2040's second core (ili9341.QueuedDisplay) so the
+# next RTC read and text layout overlap with the transfers of the last one.
+DRAW_ON_CORE1 = True
+
 # Global variable for temperature unit preference
 METRIC_UNITS = True # True for Celsius, False for Fahrenheit
 
@@ -45,7 +74,7 @@ rtc = None
 try:
     scl_pin_obj = machine.Pin(I2C_SCL_PIN)
     sda_pin_obj = machine.Pin(I2C_SDA_PIN)
-    i2c = machine.I2C(0, scl=scl_pin_obj, sda=sda_pin_obj, freq=100000) # Use I2C bus 0
+    i2c = machine.I2C(0, scl=scl_pin_obj, sda=sda_pin_obj, freq=400000) # Use I2C bus 0, DS3231 supports 400 kHz Fast-mode
     
     # Scan I2C bus to check for DS3231 (optional debug)
     # print("Scanning I2C bus...")
@@ -66,11 +95,19 @@ spi = None
 display = None
 screen_writer = None
 
+# Static labels and their precomputed positions (set once the writer is up)
+TITLE_STR = "PICO CLOCK"
+TEMP_LABEL_STR = "Temperature"
+FONT_HEIGHT = 0
+_TITLE_X = 0
+_TEMP_LABEL_X = 0
+
 try:
-    spi = machine.SPI(0, baudrate=40000000, # Standard SPI0 pins
+    spi = machine.SPI(0, baudrate=SPI_BAUDRATE, # Standard SPI0 pins
                       sck=machine.Pin(SPI_SCK_PIN),
                       mosi=machine.Pin(SPI_MOSI_PIN),
                       miso=machine.Pin(SPI_MISO_PIN) if SPI_MISO_PIN != -1 else None)
+    print(f"SPI configured: {spi}") # repr shows the baudrate actually achieved
 
     display = ili9341.ILI9341(spi,
                               cs=machine.Pin(ILI9341_CS_PIN),
@@ -84,12 +121,23 @@ try:
                                         # If text appears sideways, change rotation (e.g. to 1 for landscape if preferred)
 
     display.fill(ili9341.BLACK) # Clear display
+    if DRAW_ON_CORE1:
+        try:
+            display = ili9341.QueuedDisplay(display) # Used like the display itself from here on
+        except Exception as e:
+            # No _thread, or core 1 already in use: draw from this core instead
+            print(f"Drawing on core 0: {e}")
 
     # Initialize Writer for text
     # Ensure font6._font is the actual bytearray data from your font6.py
-    screen_writer = writer.Writer(display, font6._font) 
+    screen_writer = writer.Writer(display, font6._font, rows=font6_rows)
     writer.Writer.set_clip(True, True, False) # Clip text, no verbose messages
     screen_writer.text_color = ili9341.WHITE # Default text color
+
+    # Static label geometry never changes, so measure it once here rather than every tick
+    FONT_HEIGHT = screen_writer.height
+    _TITLE_X = (DISPLAY_WIDTH - screen_writer.stringlen(TITLE_STR)) // 2
+    _TEMP_LABEL_X = (DISPLAY_WIDTH - screen_writer.stringlen(TEMP_LABEL_STR)) // 2
     
 except Exception as e:
     print(f"Error initializing ILI9341 display: {e}")
@@ -160,26 +208,139 @@ def c_to_f(celsius):
 # Python struct_time: (..., ..., ..., ..., ..., ..., tm_wday, ...) where tm_wday is 0-6 (Mon=0..Sun=6)
 DAYS_OF_WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 
+# "00".."99" packed back to back: digits of n are at [2n] and [2n + 1].
+# The HH:MM:SS string is built by copying these into one persistent template
+# instead of running the f-string formatter every second.
+_TWO_DIGIT = "".join("%02d" % n for n in range(100)).encode()
+_time_buf = bytearray(b"00:00:00")
+
+
+def format_time(hour, minute, sec):
+    buf = _time_buf
+    lut = _TWO_DIGIT
+    buf[0] = lut[2 * hour]
+    buf[1] = lut[2 * hour + 1]
+    buf[3] = lut[2 * minute]
+    buf[4] = lut[2 * minute + 1]
+    buf[6] = lut[2 * sec]
+    buf[7] = lut[2 * sec + 1]
+    return buf.decode() # Writer.printstring expects str
+
 # Global vars for min/max temp (simple daily reset logic not implemented here)
 min_temperature_c = 100.0
 max_temperature_c = -100.0
 current_temperature_c = 0.0
 
+# Last string drawn for each screen field: key -> (x, y, text, color).
+# Lets update_display_info repaint only the fields that changed instead of
+# blanking the whole 240x320 panel every second.
+_prev_fields = {}
+# Datetime buffer and temperature shown by the last update; identical readings
+# skip the redraw. _last_dt is copied into, never reallocated.
+_last_dt = bytearray(8)
+_last_temp = None
+
+
+def _draw_field(key, x, y, s, color):
+    prev = _prev_fields.get(key)
+    start = 0 # Index of the first character that has to be drawn
+    offset = 0 # Pixel offset of that character along the line
+    if prev:
+        px, py, ps, pcolor = prev
+        same_place = px == x and py == y and pcolor == color
+        if same_place:
+            if ps == s:
+                return # Unchanged, nothing to send over SPI
+            # Keep the unchanged leading characters, e.g. "12:34:" when only
+            # the seconds tick, and redraw just the tail
+            n = min(len(ps), len(s))
+            while start < n and ps[start] == s[start]:
+                start += 1
+            if start:
+                offset = screen_writer.stringlen(ps[:start])
+        old_w = screen_writer.stringlen(ps[start:])
+        new_w = 0
+        if same_place and screen_writer.bgcolor == ili9341.BLACK:
+            # Glyph backgrounds are opaque black, so the new text overwrites
+            # what it covers; only erase what sticks out past its end
+            new_w = screen_writer.stringlen(s[start:])
+        if old_w > new_w:
+            display.fill_rectangle(px + offset + new_w, py, old_w - new_w, FONT_HEIGHT, ili9341.BLACK)
+    screen_writer.text_color = color
+    screen_writer.set_textpos(display, x + offset, y)
+    screen_writer.printstring(s[start:])
+    _prev_fields[key] = (x, y, s, color)
+
+
+# The time readout changes every second. It is composed in an in-RAM frame
+# buffer exactly as wide as the text (a wider band would overwrite the
+# temperature, which shares its rows) and sent as one block write. The
+# digits are copied into it from the writer's pre-rendered digit strip.
+_time_region = None
+_time_writer = None
+
+
+def _draw_time(x, y, s, color):
+    global _time_region, _time_writer
+    prev = _prev_fields.get("time")
+    if prev == (x, y, s, color):
+        return # Unchanged, nothing to send over SPI
+    w = screen_writer.stringlen(s)
+    if _time_region is None or _time_region.width != w:
+        # Only a variable pitch font changes the width
+        _time_region = ili9341.FrameRegion(display, w, FONT_HEIGHT)
+        _time_writer = writer.Writer(_time_region, font6._font, color, ili9341.BLACK, rows=font6_rows)
+        _time_writer.build_digit_strip()
+    if prev:
+        px, py, ps, pcolor = prev
+        old_w = screen_writer.stringlen(ps)
+        if px != x or py != y or old_w > w:
+            display.fill_rectangle(px, py, old_w, FONT_HEIGHT, ili9341.BLACK)
+    _time_region.fill(ili9341.BLACK)
+    _time_writer.text_color = color
+    _time_writer.set_textpos(_time_region, 0, 0)
+    _time_writer.printdigits(s)
+    _time_region.show(x, y)
+    _prev_fields["time"] = (x, y, s, color)
+
+
+def clear_display():
+    global _last_temp
+    display.fill(ili9341.BLACK)
+    _prev_fields.clear() # Everything must be redrawn
+    _last_temp = None # Forces the next update through the unchanged-reading check
+
 
-def update_display_info(dt_tuple, temp_c):
-    global min_temperature_c, max_temperature_c, current_temperature_c
+# dt is the 8-byte buffer from DS3231.datetime_buf(), indexed by ds3231.DT_*
+def update_display_info(dt, temp_c):
+    global min_temperature_c, max_temperature_c, current_temperature_c, _last_temp
     
     if not screen_writer or not display:
         print("Display or writer not initialized.")
         return
 
+    # The loop polls faster than the clock ticks; nothing to do until a reading changes
+    if temp_c == _last_temp and dt == _last_dt:
+        return
+    _last_dt[:] = dt
+    _last_temp = temp_c
+
+    # A message left by _handle_error() is erased by the first good update;
+    # no field below covers its rows
+    err = _prev_fields.pop("error", None)
+    if err:
+        display.fill_rectangle(err[0], err[1], screen_writer.stringlen(err[2]), FONT_HEIGHT, ili9341.BLACK)
+
     current_temperature_c = temp_c
     if temp_c > max_temperature_c:
         max_temperature_c = temp_c
     if temp_c < min_temperature_c:
         min_temperature_c = temp_c
 
-    year, month, mday, wday_rtc, hour, minute, sec, _ = dt_tuple
+    year = dt[ds3231.DT_YEAR] + 2000 # Assumes 21st century
+    month = dt[ds3231.DT_MONTH]
+    mday = dt[ds3231.DT_MDAY]
+    wday_rtc = dt[ds3231.DT_WDAY]
 
     # Map RTC weekday (1-7, Mon=1) to Python weekday (0-6, Mon=0) for DAYS_OF_WEEK lookup
     # If RTC wday is 1 (Mon) -> DAYS_OF_WEEK index 0
@@ -188,7 +349,7 @@ def update_display_info(dt_tuple, temp_c):
     if py_wday < 0: py_wday = 6 # Should not happen if RTC returns 1-7 for Mon-Sun
 
     date_str = f"{DAYS_OF_WEEK[py_wday]}, {mday:02}/{month:02}/{year}"
-    time_str = f"{hour:02}:{minute:02}:{sec:02}"
+    time_str = format_time(dt[ds3231.DT_HOUR], dt[ds3231.DT_MINUTE], dt[ds3231.DT_SECOND])
 
     if METRIC_UNITS:
         temp_display_str = f"{temp_c:.1f} C"
@@ -202,51 +363,36 @@ def update_display_info(dt_tuple, temp_c):
         min_temp_str = f"Min:{min_temp_f:.1f}F"
         max_temp_str = f"Max:{max_temp_f:.1f}F"
 
-    # Clear display before drawing new info
-    display.fill(ili9341.BLACK)
-
     # --- Layout using Writer ---
+    # Only fields whose text changed since the last call are erased and redrawn.
     # Title
-    screen_writer.text_color = ili9341.CYAN
-    screen_writer.set_textpos(display, 10, (DISPLAY_WIDTH - screen_writer.stringlen("PICO CLOCK")) // 2) # Centered
-    screen_writer.printstring("PICO CLOCK")
+    _draw_field("title", 10, _TITLE_X, TITLE_STR, ili9341.CYAN) # Centered
 
     # Date
-    screen_writer.text_color = ili9341.GREEN
     # Approx center: (DISPLAY_WIDTH - screen_writer.stringlen(date_str)) // 2
-    screen_writer.set_textpos(display, 40, 10) 
-    screen_writer.printstring(date_str)
+    _draw_field("date", 40, 10, date_str, ili9341.GREEN)
 
     # Time (larger) - Writer doesn't directly support scaling. 
     # For scaling, you'd need a larger font or draw char by char with scaling.
     # For now, use same font size.
-    screen_writer.text_color = ili9341.WHITE
     # Approx center: (DISPLAY_WIDTH - screen_writer.stringlen(time_str)) // 2
-    screen_writer.set_textpos(display, 70, (DISPLAY_WIDTH - screen_writer.stringlen(time_str)*1)//2 ) # Assuming font6 is small
     # If we want "larger" time, we'd need to use a larger font file and switch Writer's font
     # or implement a custom scaling draw routine.
     # For simplicity, we use one font.
-    screen_writer.printstring(time_str) 
+    _draw_time(70, (DISPLAY_WIDTH - screen_writer.stringlen(time_str)*1)//2, time_str, ili9341.WHITE) # Assuming font6 is small
 
 
     # Temperature Label
-    screen_writer.text_color = ili9341.YELLOW
-    screen_writer.set_textpos(display, 110, (DISPLAY_WIDTH - screen_writer.stringlen("Temperature")) // 2)
-    screen_writer.printstring("Temperature")
+    _draw_field("temp_label", 110, _TEMP_LABEL_X, TEMP_LABEL_STR, ili9341.YELLOW)
 
     # Temperature Value (larger)
-    screen_writer.text_color = ili9341.WHITE
-    screen_writer.set_textpos(display, 140, (DISPLAY_WIDTH - screen_writer.stringlen(temp_display_str)) // 2)
-    screen_writer.printstring(temp_display_str)
+    _draw_field("temp", 140, (DISPLAY_WIDTH - screen_writer.stringlen(temp_display_str)) // 2, temp_display_str, ili9341.WHITE)
     
     # Min/Max Temperature
-    screen_writer.text_color = ili9341.RED
-    screen_writer.set_textpos(display, 180, 10)
-    screen_writer.printstring(max_temp_str)
+    _draw_field("max", 180, 10, max_temp_str, ili9341.RED)
     
-    screen_writer.text_color = ili9341.BLUE # Changed from RED for min to distinguish
-    screen_writer.set_textpos(display, 180, DISPLAY_WIDTH - screen_writer.stringlen(min_temp_str) - 10) # Right align approx
-    screen_writer.printstring(min_temp_str)
+    # BLUE: changed from RED for min to distinguish. Right align approx
+    _draw_field("min", 180, DISPLAY_WIDTH - screen_writer.stringlen(min_temp_str) - 10, min_temp_str, ili9341.BLUE)
 
     # The writer updates pixels directly, no separate display.show() is usually needed for Hinch's writer
     # unless the underlying display driver requires it (our ili9341.py does not).
@@ -257,6 +403,52 @@ def update_display_info(dt_tuple, temp_c):
 
 
 # --- Main Loop ---
+# One poll of the RTC and, if the reading changed, a redraw. Compiled with the
+# native emitter since it runs on every loop iteration. Only the I2C reads
+# are guarded here: a failed read returns the exception for _handle_error().
+# Drawing errors propagate to the handler around _loop() in main().
+@micropython.native
+def _tick():
+    if rtc:
+        try:
+            current_dt = rtc.datetime_buf() # Decoded in place, no tuple allocated
+            # The DS3231 library might need a temperature conversion trigger
+            # or it might update periodically. The example used `force_temperature_conversion()`.
+            # Our DS3231 lib's `temperature()` just reads. It might be stale by up to 64s.
+            # If `start_temperature_conversion()` exists and is needed:
+            # rtc.start_temperature_conversion() 
+            # time.sleep_ms(150) # Wait for conversion (typical DS3231 conversion time)
+            current_temp_c = rtc.temperature()
+        except Exception as e:
+            return e
+
+        update_display_info(current_dt, current_temp_c)
+    else:
+        # Handle case where RTC is not available but display might be
+        if screen_writer:
+            screen_writer.set_textpos(display, 0,0)
+            screen_writer.text_color = ili9341.RED
+            screen_writer.printstring("RTC Error!")
+        print("RTC not available.")
+    return None
+
+
+# Error path, kept out of the loop: report, show a message, back off.
+def _handle_error(e):
+    print(f"Error in main loop: {e}")
+    # Optionally try to re-initialize display or show error message on it
+    if screen_writer:
+        try:
+            clear_display()
+            # Tracked as a field so update_display_info() can erase it
+            _draw_field("error", 0, 0, "Main Loop Error", ili9341.RED)
+            screen_writer.set_textpos(display, 20, 0)
+            # screen_writer.printstring(str(e)) # May be too long
+        except Exception as e2:
+            print(f"Error trying to display main loop error: {e2}")
+    time.sleep(5) # Pause before retrying
+
+
 def main():
     # Call set_initial_rtc_time() ONCE when you first run the code
     # then comment it out for subsequent runs.
@@ -277,44 +469,34 @@ def main():
             time.sleep(0.5)
         # return # Stop further execution
 
+    clear_display() # Start from a blank screen; fields are then redrawn only on change
     print("Starting main loop...")
+    # The exception handler sits outside the polling loop, so the steady
+    # state sets up no handler per iteration. After a drawing error the
+    # loop is simply entered again.
     while True:
         try:
-            if rtc:
-                current_dt = rtc.datetime()
-                # The DS3231 library might need a temperature conversion trigger
-                # or it might update periodically. The example used `force_temperature_conversion()`.
-                # Our DS3231 lib's `temperature()` just reads. It might be stale by up to 64s.
-                # If `start_temperature_conversion()` exists and is needed:
-                # rtc.start_temperature_conversion() 
-                # time.sleep_ms(150) # Wait for conversion (typical DS3231 conversion time)
-                current_temp_c = rtc.temperature()
-
-                update_display_info(current_dt, current_temp_c)
-            else:
-                # Handle case where RTC is not available but display might be
-                if screen_writer:
-                    screen_writer.set_textpos(display, 0,0)
-                    screen_writer.text_color = ili9341.RED
-                    screen_writer.printstring("RTC Error!")
-                print("RTC not available.")
-
-            time.sleep(1) # Update every second
-
+            _loop()
         except Exception as e:
-            print(f"Error in main loop: {e}")
-            # Optionally try to re-initialize display or show error message on it
-            if screen_writer:
-                try:
-                    display.fill(ili9341.BLACK)
-                    screen_writer.set_textpos(display, 0, 0)
-                    screen_writer.text_color = ili9341.RED
-                    screen_writer.printstring("Main Loop Error")
-                    screen_writer.set_textpos(display, 20, 0)
-                    # screen_writer.printstring(str(e)) # May be too long
-                except Exception as e2:
-                    print(f"Error trying to display main loop error: {e2}")
-            time.sleep(5) # Pause before retrying or exiting
+            _handle_error(e)
+
+
+# The polling loop. Polls are scheduled on fixed POLL_INTERVAL_MS boundaries
+# with ticks_ms, so time spent drawing does not stretch the period or
+# accumulate drift.
+def _loop():
+    next_t = time.ticks_ms()
+    while True:
+        err = _tick()
+        if err is not None:
+            _handle_error(err)
+
+        next_t = time.ticks_add(next_t, POLL_INTERVAL_MS)
+        delay = time.ticks_diff(next_t, time.ticks_ms())
+        if delay > 0:
+            time.sleep_ms(delay)
+        else:
+            next_t = time.ticks_ms() # Fell behind (e.g. after an error); resync
 
 
 if __name__ == "__main__":
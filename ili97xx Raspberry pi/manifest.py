@@ -0,0 +1,20 @@
+# manifest.py Freeze the clock libraries into the MicroPython firmware.
+# Frozen modules run from flash as bytecode: nothing is parsed or loaded
+# into RAM at import time. Build from the MicroPython source tree:
+#   make -C ports/rp2 BOARD=RPI_PICO submodules
+#   make -C ports/rp2 BOARD=RPI_PICO FROZEN_MANIFEST="/path/to/ili97xx Raspberry pi/manifest.py"
+# and flash ports/rp2/build-RPI_PICO/firmware.uf2.
+# opt=3 compiles like mpy-cross -O3: asserts and line numbers are stripped.
+# This sets the bytecode optimisation only; the C code is built with the
+# rp2 port's own (CMake) compiler flags, which are not overridden here.
+# main.py is not frozen: it stays on the filesystem, where it is run at
+# boot and can be edited without rebuilding the firmware.
+
+# Keep the port's own frozen modules
+include("$(PORT_DIR)/boards/manifest.py")
+
+module("ds3231.py", opt=3)
+module("ili9341.py", opt=3)
+module("writer.py", opt=3)
+module("font6.py", opt=3)
+module("font6_rows.py", opt=3)
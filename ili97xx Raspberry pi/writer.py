@@ -13,6 +13,7 @@
 # Methods:
 # clear_screen()
 # printstring(s)
+# printdigits(s) Like printstring, fast path for clock readouts
 # height() Font height in pixels
 # stringlen(s) Width of a string in pixels.
 
@@ -38,6 +39,10 @@
 
 # TODO Add sensible defaults to set_textpos like CWriter does.
 
+import micropython
+from array import array
+from collections import OrderedDict
+
 _TWO_BYTE_INDEX = const(0)  # Font has two byte index for char codes
 _ONE_BYTE_INDEX = const(1)
 _MAX_CHARS = const(2)  # Maximum number of chars in font
@@ -72,53 +77,304 @@ def _get_char_addr(font, letter):
     return offset + index + 1 + (font[_LAST_CHAR] - font[_MISSING + 2]) * (font[font[_MAX_CHARS]] == _TWO_BYTE_INDEX)
 
 
+# Rasterize one glyph straight into a 16-bit frame buffer using native code.
+# Used by Writer.draw_char when the display exposes its frame buffer as
+# .buffer, instead of a Python-level _display.pixel() call per pixel.
+# Bit addressing matches draw_char. bgcolor < 0 means transparent; pixels
+# outside the fbw x fbh buffer are clipped. There is one function per
+# orientation, called by _glyph_portrait/_glyph_landscape and the matching
+# Writer._render_*, so neither has to test the orientation itself.
+@micropython.viper
+def _draw_char_portrait(fnt: ptr8, offset: int, width: int, height: int, x: int, y: int,
+                        fb: ptr16, fbw: int, fbh: int, color: int, bgcolor: int):
+    if height & 7 == 0:
+        # Each column is a whole number of bytes, each byte holding 8
+        # consecutive rows (LSB first): load a byte once and shift out 8 pixels.
+        for col in range(width):
+            px = x + col
+            if px < 0 or px >= fbw:
+                continue
+            src = offset + ((col * height) >> 3)
+            strip = 0
+            while strip < height:
+                b = fnt[src + (strip >> 3)]
+                py = y + strip
+                for bit in range(8):
+                    if py >= 0 and py < fbh:
+                        if b & 1:
+                            fb[py * fbw + px] = color
+                        elif bgcolor >= 0:
+                            fb[py * fbw + px] = bgcolor
+                    b >>= 1
+                    py += 1
+                strip += 8
+    else:
+        for row in range(height):
+            py = y + row
+            if py < 0 or py >= fbh:
+                continue
+            for col in range(width):
+                px = x + col
+                if px < 0 or px >= fbw:
+                    continue
+                if fnt[offset + ((col * height + row) >> 3)] & (1 << (row & 7)):
+                    fb[py * fbw + px] = color
+                elif bgcolor >= 0:
+                    fb[py * fbw + px] = bgcolor
+
+
+# Landscape counterpart of _draw_char_portrait: rotated 90 degrees clockwise
+@micropython.viper
+def _draw_char_landscape(fnt: ptr8, offset: int, width: int, height: int, x: int, y: int,
+                         fb: ptr16, fbw: int, fbh: int, color: int, bgcolor: int):
+    for row in range(height):
+        px = x + row
+        if px < 0 or px >= fbw:
+            continue
+        for col in range(width):
+            py = y + width - col - 1
+            if py < 0 or py >= fbh:
+                continue
+            if fnt[offset + ((row * width + col) >> 3)] & (1 << (col & 7)):
+                fb[py * fbw + px] = color
+            elif bgcolor >= 0:
+                fb[py * fbw + px] = bgcolor
+
+
+# Fill lut, 16 * 4 RGB565 entries, for _expand_rows: entry 4 * n + k is
+# color if bit k of nibble n is set, else bgcolor.
+@micropython.viper
+def _fill_row_lut(lut: ptr16, color: int, bgcolor: int):
+    for n in range(16):
+        for k in range(4):
+            if (n >> k) & 1:
+                lut[n * 4 + k] = color
+            else:
+                lut[n * 4 + k] = bgcolor
+
+
+# Expand the row-major glyph at src[start:] (see font_rowmajor.py) into dst
+# as RGB565, taking each nibble's 4 pixels from lut (_fill_row_lut)
+# instead of testing the font bit by bit.
+@micropython.viper
+def _expand_rows(src: ptr8, start: int, width: int, height: int, lut: ptr16, dst: ptr16):
+    p = 0
+    for row in range(height):
+        col = 0
+        while col < width:
+            b = src[start]
+            start += 1
+            n = width - col
+            if n > 8:
+                n = 8
+            i = (b & 0x0F) << 2
+            k = 0
+            while k < n:
+                if k == 4:
+                    i = (b >> 4) << 2
+                dst[p] = lut[i + (k & 3)]
+                p += 1
+                k += 1
+            col += n
+
+
+def _swap16(c):
+    return (c & 0xFF) << 8 | (c >> 8) & 0xFF
+
+
+# Draw n pixels from (x, y), along x if horiz else along y, as one
+# hline/vline call where the display has them. The span is clipped here:
+# ili9341.fill_rectangle clamps an off-screen rectangle rather than
+# dropping it.
+def _span(display, x, y, n, color, horiz):
+    if horiz:
+        if y < 0 or y >= display.height:
+            return
+        if x < 0:
+            n += x
+            x = 0
+        n = min(n, display.width - x)
+        if n <= 0:
+            return
+        line = getattr(display, 'hline', None)
+        if line is not None:
+            line(x, y, n, color)
+        else:
+            for i in range(n):
+                display.pixel(x + i, y, color)
+    else:
+        if x < 0 or x >= display.width:
+            return
+        if y < 0:
+            n += y
+            y = 0
+        n = min(n, display.height - y)
+        if n <= 0:
+            return
+        line = getattr(display, 'vline', None)
+        if line is not None:
+            line(x, y, n, color)
+        else:
+            for i in range(n):
+                display.pixel(x, y + i, color)
+
+
+# Draw the glyph at font address offset on display at (x, y) and return
+# its width, as Writer.draw_char_at. Writer binds the one for its
+# orientation when landscape is set (Writer._draw_glyph).
+def _glyph_portrait(offset, x, y, display, fnt, color, bgcolor, buf, skip_bg):
+    height = fnt[_HEIGHT]
+    width = fnt[offset]  # Width of this char
+    offset += 1  # Address of data for this char
+    bgcolor_px = None if skip_bg else bgcolor
+    if _glyph_block(_draw_char_portrait, fnt, offset, width, height, width, height, x, y,
+                    display, color, bgcolor, bgcolor_px, buf):
+        return width
+    # Each glyph row is drawn as runs of same-colored pixels, one hline
+    # (one SPI transaction on ili9341) per run rather than one pixel() per
+    # pixel. on is -1 past the end to flush the last run.
+    for row in range(height):
+        start = 0
+        prev = -1
+        for col in range(width + 1):
+            if col == width:
+                on = -1
+            else:
+                on = 1 if fnt[offset + (col * height + row) // 8] & (1 << (row % 8)) else 0
+            if on != prev:
+                if prev >= 0:
+                    c = color if prev else bgcolor_px
+                    if c is not None:
+                        _span(display, x + start, y + row, col - start, c, True)
+                start = col
+                prev = on
+    return width
+
+
+# Landscape counterpart of _glyph_portrait: rotated 90 degrees clockwise,
+# glyph rows running down the display as vline runs
+def _glyph_landscape(offset, x, y, display, fnt, color, bgcolor, buf, skip_bg):
+    height = fnt[_HEIGHT]
+    width = fnt[offset]
+    offset += 1
+    bgcolor_px = None if skip_bg else bgcolor
+    if _glyph_block(_draw_char_landscape, fnt, offset, width, height, height, width, x, y,
+                    display, color, bgcolor, bgcolor_px, buf):
+        return width
+    for row in range(height):
+        start = 0
+        prev = -1
+        for col in range(width + 1):
+            if col == width:
+                on = -1
+            else:
+                on = 1 if fnt[offset + (row * width + col) // 8] & (1 << (col % 8)) else 0
+            if on != prev:
+                if prev >= 0:
+                    c = color if prev else bgcolor_px
+                    if c is not None:
+                        _span(display, x + row, y + width - col, col - start, c, False)
+                start = col
+                prev = on
+    return width
+
+
+# Fast paths shared by _glyph_portrait/_glyph_landscape, raster being the
+# matching _draw_char_* and w x h the glyph's size on screen. Returns True
+# if the glyph was drawn, False to fall back to hline/vline runs.
+# Displays with an in-RAM frame buffer (.buffer) are drawn into natively.
+# Otherwise, if the display has blit_buffer() and the background is opaque,
+# the glyph is rendered into buf (a scratch bytearray) and sent as one block
+# rather than one pixel() call, and SPI transaction, per pixel.
+def _glyph_block(raster, fnt, offset, width, height, w, h, x, y, display, color, bgcolor,
+                 bgcolor_px, buf):
+    fb = getattr(display, 'buffer', None)
+    if fb is not None:
+        raster(fnt, offset, width, height, x, y, fb, display.width, display.height,
+               color, -1 if bgcolor_px is None else bgcolor_px)
+        return True
+    blit = getattr(display, 'blit_buffer', None)
+    if blit is None or buf is None or bgcolor is None:
+        return False
+    n = w * h * 2
+    if n > len(buf) or x < 0 or y < 0 or x + w > display.width or y + h > display.height:
+        return False
+    # buf is shared scratch that a queued display (ili9341.QueuedDisplay)
+    # may not have sent yet. Rather than wait for its queue to drain, the
+    # glyph gets a buffer of its own there.
+    if hasattr(display, 'wait'):
+        buf = bytearray(n)
+    # The block is sent as big-endian RGB565 but ptr16 stores are
+    # little-endian on the supported MCUs, so swap the colors.
+    raster(fnt, offset, width, height, 0, 0, buf, w, h, _swap16(color), _swap16(bgcolor))
+    blit(memoryview(buf)[:n], x, y, w, h)
+    return True
+
+
 class Writer():
     # Default scroll delay (ms)
     # dscroll = 100  # Not currently implemented
 
+    # Maximum number of rendered glyphs kept in each Writer's glyph cache,
+    # least recently used evicted first; 0 disables the cache. Each entry is
+    # a w * h * 2 byte RGB565 block (96 bytes for the 6x8 font6), so the
+    # default costs about 4.5 KB of RAM with that font.
+    glyph_cache_size = 48
+
+    # Maximum number of color pairs _row_lut() keeps a table for (128 bytes
+    # each) before starting over
+    row_lut_count = 8
+
+    # Characters pre-rendered by build_digit_strip() for printdigits()
+    DIGITS = '0123456789: '
+
     # Print a single character at the current position and wrap.
     # Does not update display.
     # This is the essential drawing routine which needs to be overridden for
     # particular display types e.g. by Writer.draw_char_points for line drawing
     # displays such as the PyPortal. It is also overridden by the CWriter
     # and FastWriter classes.
+    # If the display has blit_buffer() and the background is opaque, the glyph
+    # is rendered into _buf (a scratch bytearray) and sent as one block rather
+    # than one pixel() call, and SPI transaction, per pixel.
+    # _skip_bg tells it the area underneath is already _bgcolor (e.g. just
+    # cleared), so background cells need not be written. A block write covers
+    # them anyway, so only the framebuffer and pixel() paths honour it.
     @staticmethod
-    def draw_char(char_code, x, y, _display, _font, _color, _bgcolor, _landscape, _reverse):
-        fnt = _font
-        height = fnt[_HEIGHT]
+    def draw_char(char_code, x, y, _display, _font, _color, _bgcolor, _landscape, _reverse, _buf=None,
+                  _skip_bg=False):
         # offset is address of char definition in font array
-        offset = _get_char_addr(fnt, char_code)
+        offset = _get_char_addr(_font, char_code)
         # If it's an empty definition, bail
         if offset == 0:
             return True # Success
-        width = fnt[offset]  # Width of this char
-        offset += 1  # Address of data for this char
-        buf = memoryview(fnt)
+        return Writer.draw_char_at(offset, x, y, _display, _font, _color, _bgcolor, _landscape,
+                                   _reverse, _buf, _skip_bg)
+
+    # As draw_char, for a glyph whose address in the font (as returned by
+    # _get_char_addr or Writer._addr) is already known.
+    @staticmethod
+    def draw_char_at(offset, x, y, _display, _font, _color, _bgcolor, _landscape, _reverse, _buf=None,
+                     _skip_bg=False):
         if _landscape:
-            for row in range(height):
-                for col in range(width):
-                    # Read the font data
-                    if fnt[offset + (row * width + col) // 8] & (1 << (col % 8)):
-                        _display.pixel(x + row, y + width - col -1, _color)
-                    elif _bgcolor is not None:
-                        _display.pixel(x + row, y + width - col -1, _bgcolor)
+            draw = _glyph_landscape
         else:
-            for row in range(height):
-                for col in range(width):
-                    if fnt[offset + (col * height + row) // 8] & (1 << (row % 8)):
-                        _display.pixel(x + col, y + row, _color)
-                    elif _bgcolor is not None:
-                        _display.pixel(x + col, y + row, _bgcolor)
-        return width
+            draw = _glyph_portrait
+        return draw(offset, x, y, _display, _font, _color, _bgcolor, _buf, _skip_bg)
 
     # Optional arguments color and bgcolor. Note that these are numbers not objects.
     # They are an optimisation for the normal case where the Writer has an SSD instance
     # and these colors are fixed. In the case of a display which supports true color
     # these values are passed to the font object.
-    def __init__(self, device, font, color=1, bgcolor=0, verbose=True):
+    # rows is an optional module made from the font by font_rowmajor.py; on
+    # block-write displays portrait glyphs are then expanded a byte at a time.
+    def __init__(self, device, font, color=1, bgcolor=0, verbose=True, rows=None):
         super().__init__()
         self.device = device
         self.font = font
+        # One memoryview over the font, created once and used for all glyph
+        # lookups and drawing instead of subscripting the raw bytes object.
+        self._fnt_mv = memoryview(font)
         # Current text color
         self.text_color = color
         # Current background color (None == transparent)
@@ -137,9 +393,43 @@ class Writer():
         self._clip = verbose  # Default to verbose messages
         self._ha = True  # Default to horizontal alignment (landscape mode)
         self._va = False  # Default to vertical alignment
+        # Font header fields used by every glyph lookup, parsed once here
+        # rather than re-read from the font on each _get_char_addr call.
+        idx = font[_MAX_CHARS]
+        self._two_byte = font[idx] == _TWO_BYTE_INDEX
+        self._idx_base = idx + 1  # Start of the offset table
+        self._first = font[_MISSING + 2]  # font[_FIRST_CHAR]
+        self._last = font[_LAST_CHAR]
+        self._missing = font[_MISSING]
+        self._data_base = self._idx_base + 1 + (self._last - self._first) * self._two_byte
+        # Width of each char from _first to _last - 1, and of the "missing"
+        # char used for all others, set by _build_widths() on first use of
+        # _char_width/stringlen
+        self._widths = None
+        self._missing_width = 0
         # Current font dimensions
         self.height = font[_HEIGHT]  # Font height
         self.max_width = font[_WIDTH]  # Max character width
+        # Scratch RGB565 buffer for rendering one glyph before blitting it
+        self._glyph_buf = bytearray(self.max_width * self.height * 2)
+        # Rendered glyphs for block-write displays, keyed by
+        # (char_code, color, bgcolor, landscape) -> (rgb565_buf, w, h).
+        # Repeated characters (clock digits) are blitted without re-decoding
+        # the font. Displays without blit_buffer are drawn by draw_char.
+        self._glyph_cache = OrderedDict()
+        # All of DIGITS rendered into one bytearray by build_digit_strip(),
+        # one fixed-size slot per char; see printdigits().
+        self._digits_strip = None
+        self._digits_key = None  # (color, bgcolor, landscape) it was built for
+        self._digits_geom = None  # Per char (w, h, advance)
+        self._digits_slot = 0  # Bytes per slot
+        # Row-major glyphs (see font_rowmajor.py) and the tables used to
+        # expand them, keyed by (color, bgcolor); see _row_lut()
+        self._rows = rows
+        self._luts = {}
+        # Block writes are preferred whenever the device has them, including
+        # frame buffers such as ili9341.FrameRegion that also expose .buffer
+        self._blit = getattr(device, 'blit_buffer', None)
         self.baseline = self.height -1  # Baseline is at bottom of char row
         # Default mapping of space character to its font width
         self.map_space = True
@@ -169,9 +459,26 @@ class Writer():
 
     # Return the screen width of a string in pixels
     def stringlen(self, s):
+        widths = self._widths
+        if widths is None:
+            widths = self._build_widths()
+        first = self._first
+        last = self._last
+        missing = self._missing_width
+        map_space = self.map_space
         l = 0
+        b = s.encode() # As in printstring: bytes yield codes without ord()
+        if len(b) == len(s):
+            s = b
+        else:
+            s = [ord(char) for char in s]
         for char_code in s:
-            l += self._char_width(ord(char_code))
+            if map_space and char_code == 32:
+                char_code = 48
+            if first <= char_code < last:
+                l += widths[char_code - first]
+            else:
+                l += missing
         return l
 
     # Return the font height in pixels
@@ -180,22 +487,49 @@ class Writer():
 
     # Return the width of a single char
     def _char_width(self, char_code):
-        # If it's an empty definition, width is 0
-        if _get_char_addr(self.font, char_code) == 0:
-            return 0
+        widths = self._widths
+        if widths is None:
+            widths = self._build_widths()
         # Width of space char is a special case to facilitate variable pitch fonts
         # The space char in the font has zero width. If self.map_space is True
         # the width of a space is the width of the '0' character. Otherwise it
         # is zero. This is achieved by substituting '0' for space in this method.
-        if self.map_space and char_code == ord(' '):
-            char_code = ord('0')
-        # If char is not in font, use the "missing" character (usually '?')
-        if char_code >= self.font[_LAST_CHAR] or char_code < self.font[_MISSING +2]: # self.font[_FIRST_CHAR]:
-            char_code = self.font[_MISSING]
-        # Address of char definition in font array.
-        # Offset is the address of the char width byte.
-        offset = _get_char_addr(self.font, char_code) -1
-        return self.font[offset] # Width of this char
+        if self.map_space and char_code == 32:
+            char_code = 48
+        # Chars not in the font get the width of the "missing" character
+        # (usually '?').
+        if char_code >= self._last or char_code < self._first:
+            return self._missing_width
+        return widths[char_code - self._first]
+
+    # Build the width table used by _char_width and stringlen. Entry i is
+    # the width byte of char _first + i, as found through _addr.
+    def _build_widths(self):
+        fnt = self._fnt_mv
+        widths = array('B')
+        for char_code in range(self._first, self._last):
+            widths.append(fnt[self._addr(char_code) - 1])
+        self._missing_width = fnt[self._addr(self._missing) - 1]
+        self._widths = widths
+        return widths
+
+    # Return (offset, width): the glyph address as from _addr, and the width
+    # the char advances the text position by, as from _char_width. Lets
+    # _printchar resolve a char once rather than once per use.
+    def _char_info(self, char_code):
+        return self._addr(char_code), self._char_width(char_code)
+
+    # Same result as _get_char_addr(self.font, letter), using the header
+    # fields cached in __init__.
+    def _addr(self, letter):
+        if letter >= self._last or letter < self._first:
+            letter = self._missing  # Character is missing
+        letter -= self._first
+        font = self._fnt_mv
+        if self._two_byte:
+            idx = self._idx_base + letter * 2
+            return (font[idx] << 8 | font[idx + 1]) + self._data_base
+        return font[self._idx_base + letter] + self._data_base
 
     # Erase the screen. Does not update display.
     def clear_screen(self):
@@ -206,42 +540,199 @@ class Writer():
 
     # Print a string at the current position. Text may be wrapped.
     # Does not update display.
-    def printstring(self, s):
-        for char_code in s:
-            self._printchar(char_code)
+    # Pass skip_bg=True if the area has just been filled with bgcolor: the
+    # background cells of each glyph are then left untouched. Only the
+    # frame-buffer and pixel() fallbacks honour it; glyphs sent as a block
+    # (cached or not) include their background anyway at no extra cost.
+    def printstring(self, s, skip_bg=False):
+        # Iterating bytes yields char codes directly, with no ord() per char.
+        # Only for ASCII: other chars encode to several bytes.
+        b = s.encode()
+        if len(b) == len(s):
+            for char_code in b:
+                self._printchar_code(char_code, skip_bg)
+        else:
+            for char in s:
+                self._printchar_code(ord(char), skip_bg)
+
+    # Print a string made mostly of DIGITS (e.g. '12:34:56') at the current
+    # position. Each such char is blitted straight out of the pre-rendered
+    # strip with no font decoding; other chars, wrapping and clipping go
+    # through _printchar. Falls back to printstring when blitting is not
+    # possible (no blit_buffer on the device or transparent background).
+    def printdigits(self, s):
+        blit = self._blit
+        if blit is None or self.bgcolor is None:
+            self.printstring(s)
+            return
+        if self._digits_key != (self.text_color, self.bgcolor, self.landscape):
+            self.build_digit_strip()
+        strip = memoryview(self._digits_strip)
+        geom = self._digits_geom
+        slot = self._digits_slot
+        digits = self.DIGITS
+        dw = self.device.width
+        dh = self.device.height
+        for char in s:
+            idx = digits.find(char)
+            if idx >= 0:
+                w, h, advance = geom[idx]
+                x = self.x
+                y = self.y
+                if advance and x >= 0 and y >= 0 and x + w <= dw and y + h <= dh and x + advance <= dw:
+                    start = idx * slot
+                    blit(strip[start:start + w * h * 2], x, y, w, h)
+                    self.x = x + advance
+                    continue
+            self._printchar(char)
+
+    # Render DIGITS in the current colors into self._digits_strip. Called
+    # by printdigits() when the colors change; may be called at startup to
+    # keep the work off the first update.
+    def build_digit_strip(self):
+        digits = self.DIGITS
+        glyphs = []
+        slot = 0
+        for char in digits:
+            char_code = ord(char)
+            offset, advance = self._char_info(char_code)
+            if advance:
+                buf, w, h = self._render_glyph(offset)
+                if not w or not h:
+                    # Blank glyph that still advances (the space, see
+                    # map_space): store a background block the size of its
+                    # cell so the text it replaces is covered
+                    if self._landscape:
+                        w, h = self.height, advance
+                    else:
+                        w, h = advance, self.height
+                    bg = self.bgcolor
+                    buf = bytes((bg >> 8 & 0xFF, bg & 0xFF)) * (w * h)
+            else:
+                buf, w, h = b'', 0, 0
+            glyphs.append((buf, w, h, advance))
+            slot = max(slot, len(buf))
+        strip = bytearray(slot * len(digits))
+        geom = []
+        for i, (buf, w, h, advance) in enumerate(glyphs):
+            strip[i * slot:i * slot + len(buf)] = buf
+            geom.append((w, h, advance))
+        self._digits_strip = strip
+        self._digits_geom = geom
+        self._digits_slot = slot
+        self._digits_key = (self.text_color, self.bgcolor, self.landscape)
 
     # Method using Writer.draw_char which needs to be overridden for displays
     # which require points to be computed.
-    def _printchar(self, char_code):  # Print one character
-        char_code = ord(char_code)
-        # Determine width of current char
-        width = self._char_width(char_code)
+    def _printchar(self, char, skip_bg=False):  # Print one character
+        self._printchar_code(ord(char), skip_bg)
+
+    # _printchar for a char code rather than a one-char string
+    def _printchar_code(self, char_code, skip_bg=False):
+        # Attributes used repeatedly below are bound to locals once: each
+        # self./device. lookup is a dict probe in MicroPython.
+        dev = self.device
+        dw = dev.width
+        dh = dev.height
+        h = self.height
+        # Glyph address and width of current char, resolved once
+        offset, width = self._char_info(char_code)
         # If it's an empty definition, width is 0: effectively a NOP.
         if width == 0:
             return
+        x = self.x
+        y = self.y
         # Wrap text if it extends beyond the screen edge
-        if self.x + width > self.device.width:
-            self.x = 0
-            self.y += self.height
+        if x + width > dw:
+            x = 0
+            y += h
+            self.x = x
+            self.y = y
             # If screen has scrolled off top, do a clear screen
-            if self.y >= self.device.height:
+            if y >= dh:
                 self.clear_screen() # x and y are reset by this method
+                x = self.x
+                y = self.y
         # Clip if it goes off bottom of screen
-        if self.y + self.height < 0:
+        if y + h < 0:
             if self._clip and _VERBOSE:
                 print('Font too tall for screen')
             return # Don't render: off bottom of screen
 
         # Off top of screen
-        if self.y >= self.device.height:
+        if y >= dh:
             if self._clip and _VERBOSE:
                 print('Font off bottom of screen')
             return
 
         # All clear to draw the character
-        Writer.draw_char(char_code, self.x, self.y, self.device, self.font,
-                         self.text_color, self.bgcolor, self.landscape, self.reverse)
-        self.x += width
+        bgcolor = self.bgcolor
+        blit = self._blit
+        if blit is not None and bgcolor is not None:
+            key = (char_code, self.text_color, bgcolor, self._landscape)
+            cache = self._glyph_cache
+            # Popped and re-inserted on a hit so the dict stays in LRU order
+            # (MicroPython's OrderedDict has no move_to_end)
+            glyph = cache.pop(key, None)
+            if glyph is None:
+                glyph = self._render_glyph(offset)
+                size = self.glyph_cache_size
+                if cache and len(cache) >= size:
+                    del cache[next(iter(cache))] # Evict the least recently used
+            if self.glyph_cache_size > 0:
+                cache[key] = glyph
+            buf, gw, gh = glyph
+            if x >= 0 and y >= 0 and x + gw <= dw and y + gh <= dh:
+                if gw and gh: # A blank glyph has nothing to send
+                    blit(buf, x, y, gw, gh)
+                self.x = x + width
+                return
+        self._draw_glyph(offset, x, y, dev, self._fnt_mv, self.text_color, bgcolor,
+                         self._glyph_buf, skip_bg)
+        self.x = x + width
+
+    # Render the glyph at font address offset (from _char_info) in the
+    # current colors as a big-endian RGB565 block for blit_buffer.
+    # Returns (buf, w, h). _render_glyph is bound to this or
+    # _render_landscape by the landscape setter.
+    def _render_portrait(self, offset):
+        fnt = self._fnt_mv
+        height = fnt[_HEIGHT]
+        width = fnt[offset]
+        buf = bytearray(width * height * 2)
+        if self._rows is not None:
+            start = self._rows.index.get(offset)
+            if start is not None:
+                _expand_rows(self._rows.rows, start + 1, width, height, self._row_lut(), buf)
+                return buf, width, height
+        _draw_char_portrait(fnt, offset + 1, width, height, 0, 0, buf, width, height,
+                            _swap16(self.text_color), _swap16(self.bgcolor))
+        return buf, width, height
+
+    # As _render_portrait, rotated: the block is height wide, width high
+    def _render_landscape(self, offset):
+        fnt = self._fnt_mv
+        height = fnt[_HEIGHT]
+        width = fnt[offset]
+        buf = bytearray(width * height * 2)
+        _draw_char_landscape(fnt, offset + 1, width, height, 0, 0, buf, height, width,
+                             _swap16(self.text_color), _swap16(self.bgcolor))
+        return buf, height, width
+
+    # Return the nibble table for _expand_rows in the current colors. One
+    # table per color pair is kept, so a Writer drawing fields in several
+    # colors does not rebuild it on every color change.
+    def _row_lut(self):
+        key = (self.text_color, self.bgcolor)
+        luts = self._luts
+        lut = luts.get(key)
+        if lut is None:
+            if len(luts) >= self.row_lut_count:
+                luts.clear()
+            lut = bytearray(16 * 4 * 2)
+            _fill_row_lut(lut, _swap16(self.text_color), _swap16(self.bgcolor))
+            luts[key] = lut
+        return lut
 
     # This method is out of date. The code has been incorporated into
     # Writer.draw_char().
@@ -256,6 +747,22 @@ class Writer():
             cls._vba = _NO_VERBOSE
         return # cls._clip # TEST
 
+    # Text rotation. Setting it also binds the glyph drawing and rendering
+    # functions for that orientation, so printing never tests it per glyph.
+    @property
+    def landscape(self):
+        return self._landscape
+
+    @landscape.setter
+    def landscape(self, value):
+        self._landscape = value
+        if value:
+            self._draw_glyph = _glyph_landscape
+            self._render_glyph = self._render_landscape
+        else:
+            self._draw_glyph = _glyph_portrait
+            self._render_glyph = self._render_portrait
+
     # For fixed pitch fonts only:
     # Return the number of characters which will fit on a row
     def chars_per_row(self):